@@ -0,0 +1,127 @@
+from fastapi import APIRouter, HTTPException
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal, Optional
+import asyncio
+import os
+import logging
+import chess
+from pydantic import BaseModel
+from engine import DIFFICULTY_LEVELS, choose_move
+from ratelimit import ConcurrencyLimiter, TokenBucketLimiter, ip_key, rate_limit
+
+router = APIRouter(prefix="/ai", tags=["ai"])
+
+logger = logging.getLogger(__name__)
+
+# Searches are CPU bound, so they run in a process pool off the event loop
+ENGINE_WORKERS = int(os.environ.get("ENGINE_WORKERS", os.cpu_count() or 1))
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Searches allowed in flight (running or waiting for a worker). Beyond this we
+# answer 503 at once rather than let requests queue behind the pool.
+MAX_PENDING_SEARCHES = ENGINE_WORKERS * int(os.environ.get("ENGINE_QUEUE_FACTOR", 2))
+pending_searches = ConcurrencyLimiter(MAX_PENDING_SEARCHES)
+
+# Per session (or IP for guests); a player never needs more than about a move a second.
+# Session tokens are not validated here, so every request also draws from a
+# looser per-IP bucket that rotating tokens can't get around. The session bucket
+# is checked first so a client it rejects doesn't drain the IP bucket shared by
+# everyone behind the same NAT.
+move_limiter = TokenBucketLimiter(rate=1.0, burst=5)
+move_ip_limiter = TokenBucketLimiter(rate=3.0, burst=10)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=ENGINE_WORKERS)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class AIMoveRequest(BaseModel):
+    fen: str
+    difficulty: Literal["easy", "medium", "hard"] = "medium"
+
+
+class AIMoveResponse(BaseModel):
+    move: Optional[str] = None  # SAN
+    uci: Optional[str] = None
+    score: int
+    depth: int
+    nodes: int
+    timed_out: bool = False
+
+
+def _search(fen: str, difficulty: str) -> dict:
+    board = chess.Board(fen)
+    result = choose_move(board, difficulty)
+    move = result.best_move
+    return {
+        "move": board.san(move) if move else None,
+        "uci": move.uci() if move else None,
+        "score": result.score,
+        "depth": result.depth,
+        "nodes": result.nodes,
+        "timed_out": result.timed_out,
+    }
+
+
+@router.post(
+    "/move",
+    response_model=AIMoveResponse,
+    dependencies=[rate_limit(move_limiter), rate_limit(move_ip_limiter, key_func=ip_key)],
+)
+async def get_ai_move(request: AIMoveRequest):
+    """Pick the AI's move for a position within the difficulty's node budget"""
+    try:
+        board = chess.Board(request.fen)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid FEN")
+    if not board.is_valid():
+        raise HTTPException(status_code=400, detail="Invalid position")
+
+    if not pending_searches.try_acquire():
+        raise HTTPException(
+            status_code=503,
+            detail="AI engine busy, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            get_executor(), _search, request.fen, request.difficulty
+        )
+    finally:
+        pending_searches.release()
+    logger.info(
+        f"AI move ({request.difficulty}): {result['move']} "
+        f"nodes={result['nodes']} depth={result['depth']}"
+    )
+    if result["timed_out"]:
+        logger.warning(f"AI search ({request.difficulty}) hit its time cap before the node budget")
+    return AIMoveResponse(**result)
+
+
+@router.get("/levels")
+async def get_levels():
+    """Difficulty levels and their per-move search budgets"""
+    return {
+        "workers": ENGINE_WORKERS,
+        "max_pending": MAX_PENDING_SEARCHES,
+        "levels": {
+            name: {
+                "max_nodes": level.max_nodes,
+                "max_depth": level.max_depth,
+                "max_time": level.max_time,
+                "noise": level.noise,
+            }
+            for name, level in DIFFICULTY_LEVELS.items()
+        },
+    }
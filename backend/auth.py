@@ -3,17 +3,22 @@ from typing import Optional
 from datetime import datetime, timedelta, timezone
 import httpx
 from models import User, Session, SessionResponse
+from ratelimit import TokenBucketLimiter, rate_limit, ip_key
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # Emergent auth endpoint
 EMERGENT_AUTH_URL = "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data"
 
+# Each session exchange fans out to the Emergent auth service.
+# Keyed by IP since the session id header is chosen by the caller.
+session_limiter = TokenBucketLimiter(rate=0.2, burst=5)
+
 async def get_db():
     from server import db
     return db
 
-@router.post("/session")
+@router.post("/session", dependencies=[rate_limit(session_limiter, key_func=ip_key)])
 async def create_session(x_session_id: str = Header(...)):
     """Exchange session_id for user data and create session"""
     try:
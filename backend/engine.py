@@ -0,0 +1,283 @@
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import chess
+
+# Simple alpha-beta engine built on python-chess.
+# Mirrors the evaluation used by the frontend AI (frontend/utils/stockfishEngine.ts)
+# so backend analysis agrees with what players see in game.
+
+MATE_SCORE = 100000
+INFINITY = MATE_SCORE + 1
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 20000,
+}
+
+# Tables are written from white's point of view, row 0 = rank 8
+POSITION_BONUS = {
+    chess.PAWN: [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [50, 50, 50, 50, 50, 50, 50, 50],
+        [10, 10, 20, 30, 30, 20, 10, 10],
+        [5, 5, 10, 25, 25, 10, 5, 5],
+        [0, 0, 0, 20, 20, 0, 0, 0],
+        [5, -5, -10, 0, 0, -10, -5, 5],
+        [5, 10, 10, -20, -20, 10, 10, 5],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    chess.KNIGHT: [
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+        [-40, -20, 0, 0, 0, 0, -20, -40],
+        [-30, 0, 10, 15, 15, 10, 0, -30],
+        [-30, 5, 15, 20, 20, 15, 5, -30],
+        [-30, 0, 15, 20, 20, 15, 0, -30],
+        [-30, 5, 10, 15, 15, 10, 5, -30],
+        [-40, -20, 0, 5, 5, 0, -20, -40],
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+    ],
+}
+
+
+# Check the clock only every this many nodes to keep the hot path cheap
+TIME_CHECK_INTERVAL = 1024
+
+# Positions in check are searched one ply deeper, up to this distance from the root
+MAX_EXTENSION_PLY = 16
+KILLER_BONUS = 50000
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when the node or time budget is spent"""
+
+
+@dataclass
+class SearchResult:
+    best_move: Optional[chess.Move]
+    score: int  # centipawns from the side to move's point of view
+    second_score: Optional[int] = None  # score of the best alternative root move
+    pv: List[chess.Move] = field(default_factory=list)
+    depth: int = 0
+    nodes: int = 0
+    timed_out: bool = False  # stopped by max_time before the node budget ran out
+
+
+@dataclass(frozen=True)
+class SkillLevel:
+    max_nodes: int
+    max_depth: int = 64
+    # Seconds. Only a safety net: set well above what max_nodes costs, since a
+    # search cut short by the clock is no longer deterministic.
+    max_time: Optional[float] = None
+    noise: int = 0  # max centipawns of evaluation noise added to each root move
+
+
+# AI difficulty tiers. Cost per move is bounded by max_nodes rather than by a
+# fixed depth, so CPU use no longer depends on how complex the position is.
+# The time caps are roughly 4x the worst case measured for each node budget.
+DIFFICULTY_LEVELS: Dict[str, SkillLevel] = {
+    "easy": SkillLevel(max_nodes=2000, max_depth=2, max_time=1.0, noise=200),
+    "medium": SkillLevel(max_nodes=10000, max_depth=4, max_time=4.0, noise=50),
+    "hard": SkillLevel(max_nodes=30000, max_time=10.0),
+}
+
+
+def evaluate(board: chess.Board) -> int:
+    """Static evaluation in centipawns from the side to move's point of view"""
+    score = 0
+    for square, piece in board.piece_map().items():
+        rank = chess.square_rank(square)
+        row = 7 - rank if piece.color == chess.WHITE else rank
+        table = POSITION_BONUS.get(piece.piece_type)
+        value = PIECE_VALUES[piece.piece_type]
+        if table:
+            value += table[row][chess.square_file(square)]
+        score += value if piece.color == chess.WHITE else -value
+    return score if board.turn == chess.WHITE else -score
+
+
+def is_mate_score(score: int) -> bool:
+    return abs(score) >= MATE_SCORE - 1000
+
+
+def _move_order_key(board: chess.Board, move: chess.Move) -> int:
+    # MVV-LVA for captures, then promotions, then quiet moves
+    key = 0
+    if board.is_capture(move):
+        victim = board.piece_type_at(move.to_square) or chess.PAWN  # en passant
+        attacker = board.piece_type_at(move.from_square)
+        key += 10 * PIECE_VALUES[victim] - PIECE_VALUES[attacker] + 100000
+    if move.promotion:
+        key += PIECE_VALUES[move.promotion]
+    return key
+
+
+def _ordered_moves(board: chess.Board, moves, first: Optional[chess.Move] = None,
+                   killers: Tuple[chess.Move, ...] = ()):
+    def key(move):
+        if move in killers and not board.is_capture(move):
+            return KILLER_BONUS
+        return _move_order_key(board, move)
+
+    ordered = sorted(moves, key=key, reverse=True)
+    if first is not None and first in ordered:
+        ordered.remove(first)
+        ordered.insert(0, first)
+    return ordered
+
+
+class Searcher:
+    """Iterative-deepening negamax search bounded by a node (and optional time) budget"""
+
+    def __init__(self, max_nodes: int, max_depth: int = 64, max_time: Optional[float] = None,
+                 noise: int = 0, seed: Optional[int] = None):
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.max_time = max_time
+        self.noise = noise
+        self.seed = seed
+        self.nodes = 0
+        self._deadline = None
+        self.timed_out = False
+        self._root_noise: Dict[chess.Move, int] = {}
+        self._killers: Dict[int, List[chess.Move]] = {}
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise SearchAborted()
+        if (self._deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0
+                and time.monotonic() > self._deadline):
+            self.timed_out = True
+            raise SearchAborted()
+
+    def _quiesce(self, board: chess.Board, alpha: int, beta: int) -> int:
+        self._tick()
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        for move in _ordered_moves(board, board.generate_legal_captures()):
+            board.push(move)
+            try:
+                score = -self._quiesce(board, -beta, -alpha)
+            finally:
+                board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _negamax(self, board: chess.Board, depth: int, alpha: int, beta: int,
+                 ply: int) -> Tuple[int, List[chess.Move]]:
+        self._tick()
+        moves = list(board.legal_moves)
+        in_check = board.is_check()
+        if not moves:
+            return (-MATE_SCORE + ply if in_check else 0), []
+        if board.is_insufficient_material() or board.halfmove_clock >= 100:
+            return 0, []
+        if in_check and ply < MAX_EXTENSION_PLY:
+            depth += 1
+        if depth <= 0:
+            return self._quiesce(board, alpha, beta), []
+
+        killers = self._killers.setdefault(ply, [])
+        best_score = -INFINITY
+        best_line: List[chess.Move] = []
+        for move in _ordered_moves(board, moves, killers=tuple(killers)):
+            board.push(move)
+            try:
+                score, line = self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            score = -score
+            if score > best_score:
+                best_score = score
+                best_line = [move] + line
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not board.is_capture(move) and move not in killers:
+                    killers.insert(0, move)
+                    del killers[2:]
+                break
+        return best_score, best_line
+
+    def _search_root(self, board: chess.Board, depth: int,
+                     first: Optional[chess.Move]) -> SearchResult:
+        # Root keeps the two best scores exact so callers can judge move uniqueness
+        best = SearchResult(best_move=None, score=-INFINITY, depth=depth)
+        for move in _ordered_moves(board, board.legal_moves, first):
+            noise = self._root_noise.get(move, 0)
+            alpha = best.second_score - noise if best.second_score is not None else -INFINITY
+            board.push(move)
+            try:
+                score, line = self._negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                board.pop()
+            score = -score + noise
+            if best.best_move is None or score > best.score:
+                if best.best_move is not None:
+                    best.second_score = best.score
+                best.best_move, best.score, best.pv = move, score, [move] + line
+            elif best.second_score is None or score > best.second_score:
+                best.second_score = score
+        return best
+
+    def search(self, board: chess.Board) -> SearchResult:
+        board = board.copy(stack=False)
+        result = SearchResult(best_move=None, score=0)
+        if board.is_game_over():
+            return result
+        if self.noise:
+            # Noise is fixed per root move for the whole search and seeded from the
+            # position, so the same position at the same level always gets the same move
+            seed = self.seed if self.seed is not None else zlib.crc32(board.fen().encode())
+            rng = random.Random(seed)
+            self._root_noise = {
+                move: rng.randint(-self.noise, self.noise)
+                for move in sorted(board.legal_moves, key=lambda m: m.uci())
+            }
+        if self.max_time is not None:
+            self._deadline = time.monotonic() + self.max_time
+        try:
+            for depth in range(1, self.max_depth + 1):
+                result = self._search_root(board, depth, result.best_move)
+                if is_mate_score(result.score):
+                    break
+        except SearchAborted:
+            pass
+        if result.best_move is None:
+            # Budget too small to finish even depth 1 - fall back to move ordering
+            result.best_move = _ordered_moves(board, board.legal_moves)[0]
+            result.pv = [result.best_move]
+            result.score = evaluate(board)
+        result.nodes = min(self.nodes, self.max_nodes)
+        result.timed_out = self.timed_out
+        return result
+
+
+def analyse(board: chess.Board, max_nodes: int, max_depth: int = 64) -> SearchResult:
+    """Search a position within a fixed node budget"""
+    return Searcher(max_nodes=max_nodes, max_depth=max_depth).search(board)
+
+
+def choose_move(board: chess.Board, difficulty: str) -> SearchResult:
+    """Pick a move for the AI at the given difficulty level"""
+    level = DIFFICULTY_LEVELS[difficulty]
+    searcher = Searcher(
+        max_nodes=level.max_nodes,
+        max_depth=level.max_depth,
+        max_time=level.max_time,
+        noise=level.noise,
+    )
+    return searcher.search(board)
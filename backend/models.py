@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class User(BaseModel):
@@ -27,3 +27,13 @@ class SessionResponse(BaseModel):
     name: str
     picture: Optional[str] = None
     session_token: str
+
+class Puzzle(BaseModel):
+    id: str
+    game_id: str
+    fen: str
+    moves: List[str]
+    rating: int
+    eval_swing: int  # centipawns, mate scores clamped
+    mate_in: Optional[int] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.utcnow())
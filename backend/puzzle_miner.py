@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Batch job that mines tactical puzzles from stored games.
+
+Streams the games collection in _id order and fans games out across a process
+pool, keeping a rolling window of submitted games so workers never sit idle
+waiting for the slowest game of a batch. Every position is scanned with a
+cheap engine search; a position becomes a candidate when the opponent's last
+move swung the evaluation and the side to move has a single clearly best
+reply. Candidates are then re-searched with a much larger budget along the
+whole solution line: every solver move must stay uniquely best, the
+opponent's replies are the engine's best defence, and the candidate is
+dropped if the deeper search no longer finds a win.
+
+Progress is checkpointed once every game up to a given _id has finished, so
+the job can be stopped and resumed. Puzzles are upserted by id, so
+re-processing a game is harmless.
+
+Nothing in the app writes games yet: this expects game documents carrying
+`moves` (SAN list, as produced by the frontend move history) and optionally
+`initial_fen`. Games without moves are skipped.
+
+Usage:
+    python puzzle_miner.py [--workers N] [--chunk-size N] [--nodes N]
+                           [--verify-nodes N] [--reset]
+"""
+
+import argparse
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import chess
+from dotenv import load_dotenv
+from pymongo import ASCENDING, MongoClient, ReplaceOne
+
+from engine import MATE_SCORE, analyse, is_mate_score
+from models import Puzzle
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger("puzzle_miner")
+
+CHECKPOINT_ID = "puzzle_miner"
+
+# Mining thresholds (centipawns)
+SWING_THRESHOLD = 200      # eval gain caused by the opponent's last move
+WINNING_THRESHOLD = 150    # side to move must end up at least this much ahead
+UNIQUE_MARGIN = 150        # best move must beat the runner-up by this much
+MAX_EVAL = 2000            # mate scores are clamped to this in swing arithmetic
+MIN_PLY = 6                # skip the opening
+MAX_SOLUTION_PLIES = 7
+
+DEFAULT_NODES = 20000
+DEFAULT_VERIFY_NODES = 200000
+DEFAULT_CHUNK_SIZE = 200
+# Games submitted ahead of the oldest unfinished one, per worker
+WINDOW_PER_WORKER = 4
+
+
+def estimate_rating(board: chess.Board, line: List[chess.Move], score: int,
+                    second_score: Optional[int]) -> int:
+    """Rough puzzle rating from solution length, move type and how forcing it is"""
+    solver_moves = (len(line) + 1) // 2
+    rating = 1000 + 250 * (solver_moves - 1)
+
+    first = line[0]
+    if board.gives_check(first):
+        rating -= 100
+    elif not board.is_capture(first):
+        rating += 200  # quiet first moves are harder to spot
+
+    if second_score is not None and not is_mate_score(score):
+        # The closer the runner-up, the subtler the puzzle
+        rating += max(0, 400 - (score - second_score)) // 2
+
+    return max(600, min(2600, rating))
+
+
+def _clamp(score: int) -> int:
+    return max(-MAX_EVAL, min(MAX_EVAL, score))
+
+
+def _mate_in(score: int) -> Optional[int]:
+    if is_mate_score(score) and score > 0:
+        return (MATE_SCORE - score + 1) // 2
+    return None
+
+
+def _is_unique(score: int, second_score: Optional[int]) -> bool:
+    if second_score is None:
+        return True
+    if is_mate_score(score) and score > 0:
+        return not (is_mate_score(second_score) and second_score > 0)
+    return score - second_score >= UNIQUE_MARGIN
+
+
+def _is_candidate(score: int, second_score: Optional[int], previous_score: int) -> bool:
+    # previous_score is from the opponent's view, score from the side to move's
+    swing = _clamp(score) + _clamp(previous_score)
+    return (swing >= SWING_THRESHOLD and score >= WINNING_THRESHOLD
+            and _is_unique(score, second_score))
+
+
+def verify_puzzle(previous: chess.Board, board: chess.Board,
+                  verify_nodes: int) -> Optional[Tuple[List[chess.Move], int, Optional[int], int]]:
+    """Re-search a candidate deeply along its whole solution line.
+
+    Returns (line, score, second_score, swing), or None when the deeper
+    search no longer sees a winning, unique solution.
+    """
+    before = analyse(previous, max_nodes=verify_nodes)
+    result = analyse(board, max_nodes=verify_nodes)
+    if result.best_move is None or not _is_candidate(result.score, result.second_score,
+                                                     before.score):
+        return None
+
+    line = [result.best_move]
+    position = board.copy()
+    position.push(result.best_move)
+    while len(line) + 2 <= MAX_SOLUTION_PLIES and not position.is_game_over():
+        # Opponent replies with the engine's best defence
+        defence = analyse(position, max_nodes=verify_nodes)
+        if -defence.score < WINNING_THRESHOLD:
+            return None
+        position.push(defence.best_move)
+
+        follow_up = analyse(position, max_nodes=verify_nodes)
+        if follow_up.best_move is None or follow_up.score < WINNING_THRESHOLD:
+            return None
+        if not _is_unique(follow_up.score, follow_up.second_score):
+            break  # the solution ends on the last move that was the only one
+        line += [defence.best_move, follow_up.best_move]
+        position.push(follow_up.best_move)
+
+    swing = _clamp(result.score) + _clamp(before.score)
+    return line, result.score, result.second_score, swing
+
+
+def mine_game(game: Tuple[str, List[str], Optional[str]], max_nodes: int,
+              verify_nodes: int = DEFAULT_VERIFY_NODES) -> List[dict]:
+    """Analyse every position of one game and return the puzzles found in it"""
+    game_id, moves, initial_fen = game
+    if not moves:
+        return []
+    if not isinstance(moves, list):
+        logger.warning(f"Game {game_id}: moves is not a list, skipping")
+        return []
+    try:
+        board = chess.Board(initial_fen) if initial_fen else chess.Board()
+    except ValueError:
+        logger.warning(f"Game {game_id}: invalid initial_fen {initial_fen!r}, skipping")
+        return []
+    if not board.is_valid():
+        logger.warning(f"Game {game_id}: impossible initial position {initial_fen!r}, skipping")
+        return []
+    previous = None
+    puzzles = []
+    previous_score = None
+
+    for ply, san in enumerate(moves + [None]):
+        result = analyse(board, max_nodes=max_nodes)
+
+        if (previous_score is not None and ply >= MIN_PLY and result.best_move is not None
+                and _is_candidate(result.score, result.second_score, previous_score)):
+            verified = verify_puzzle(previous, board, verify_nodes)
+            if verified is not None:
+                line, score, second_score, swing = verified
+                puzzle = Puzzle(
+                    id=f"{game_id}-{ply}",
+                    game_id=game_id,
+                    fen=board.fen(),
+                    moves=[move.uci() for move in line],
+                    rating=estimate_rating(board, line, score, second_score),
+                    eval_swing=swing,
+                    mate_in=_mate_in(score),
+                )
+                puzzles.append(puzzle.dict())
+
+        if san is None:
+            break
+        previous = board.copy()
+        try:
+            board.push_san(san)
+        except (ValueError, TypeError):
+            # TypeError: the stored move isn't a SAN string at all
+            logger.warning(f"Game {game_id}: illegal move {san!r} at ply {ply}, stopping")
+            break
+        previous_score = result.score
+
+    return puzzles
+
+
+def _mine_game_worker(args):
+    return mine_game(*args)
+
+
+def _iter_games(db, after_id, page_size: int):
+    # Page by _id instead of holding one cursor open for the whole run
+    while True:
+        query = {"_id": {"$gt": after_id}} if after_id is not None else {}
+        page = list(
+            db.games.find(query, {"moves": 1, "initial_fen": 1})
+            .sort("_id", ASCENDING)
+            .limit(page_size)
+        )
+        if not page:
+            return
+        yield from page
+        after_id = page[-1]["_id"]
+
+
+def run(db, workers: int, chunk_size: int, max_nodes: int,
+        verify_nodes: int = DEFAULT_VERIFY_NODES, reset: bool = False):
+    checkpoints = db.puzzle_mining_checkpoints
+    if reset:
+        checkpoints.delete_one({"_id": CHECKPOINT_ID})
+    checkpoint = checkpoints.find_one({"_id": CHECKPOINT_ID}) or {}
+    last_game_id = checkpoint.get("last_game_id")
+    games_processed = checkpoint.get("games_processed", 0)
+    puzzles_found = checkpoint.get("puzzles_found", 0)
+
+    if last_game_id is not None:
+        logger.info(f"Resuming after game {last_game_id} ({games_processed} games done)")
+
+    def save(operations, game_id, done):
+        nonlocal games_processed, puzzles_found
+        if operations:
+            db.puzzles.bulk_write(operations, ordered=False)
+        games_processed += done
+        puzzles_found += len(operations)
+        checkpoints.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$set": {
+                "last_game_id": game_id,
+                "games_processed": games_processed,
+                "puzzles_found": puzzles_found,
+                "updated_at": datetime.utcnow(),
+            }},
+            upsert=True,
+        )
+        logger.info(f"Processed {games_processed} games, {puzzles_found} puzzles so far")
+
+    window = max(1, workers * WINDOW_PER_WORKER)
+    pending = deque()
+    operations = []
+    done = 0
+    games = _iter_games(db, last_game_id, chunk_size)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            # Keep the pool saturated: submit ahead of the oldest unfinished game
+            for game in games:
+                task = ((str(game["_id"]), game.get("moves") or [], game.get("initial_fen")),
+                        max_nodes, verify_nodes)
+                pending.append((game["_id"], executor.submit(_mine_game_worker, task)))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+
+            # Results are collected in _id order, so everything up to game_id is done
+            game_id, future = pending.popleft()
+            operations += [
+                ReplaceOne({"id": puzzle["id"]}, puzzle, upsert=True)
+                for puzzle in future.result()
+            ]
+            done += 1
+            if done >= chunk_size:
+                save(operations, game_id, done)
+                operations, done = [], 0
+
+        if done:
+            save(operations, game_id, done)
+
+    logger.info(f"Done: {games_processed} games, {puzzles_found} puzzles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine tactical puzzles from stored games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES,
+                        help="search node budget per position")
+    parser.add_argument("--verify-nodes", type=int, default=DEFAULT_VERIFY_NODES,
+                        help="search node budget per position when verifying a candidate")
+    parser.add_argument("--reset", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    client = MongoClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    db.puzzles.create_index("id", unique=True)
+    db.puzzles.create_index("rating")
+    try:
+        run(db, args.workers, args.chunk_size, args.nodes,
+            verify_nodes=args.verify_nodes, reset=args.reset)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+from fastapi import Depends, HTTPException, Request
+from starlette.responses import JSONResponse
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+import asyncio
+import ipaddress
+import math
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Peers allowed to tell us the client address via X-Forwarded-For. Defaults to
+# private ranges, where the ingress proxy lives; override with TRUSTED_PROXIES
+# (comma separated addresses or CIDRs).
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(network.strip())
+    for network in os.environ.get(
+        "TRUSTED_PROXIES",
+        "127.0.0.0/8,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,::1/128,fc00::/7",
+    ).split(",")
+    if network.strip()
+]
+
+
+class TokenBucketLimiter:
+    """In-process token bucket limiter keyed by client.
+
+    Buckets are kept in LRU order, so checks are O(1) and memory is bounded:
+    idle buckets are evicted from the cold end and the total count never
+    exceeds max_keys.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000, idle_ttl: float = 600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate  # tokens refilled per second
+        self.burst = burst
+        self.max_keys = max_keys
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def allow(self, key: str) -> Tuple[bool, float]:
+        """Take a token for key. Returns (allowed, seconds until the next token)"""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(float(self.burst), tokens + (now - last) * self.rate)
+            bucket[1] = now
+        self._evict(now)
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True, 0.0
+        return False, (1.0 - bucket[0]) / self.rate
+
+    def _evict(self, now: float):
+        # Least recently used buckets sit at the front; an idle bucket has
+        # refilled completely, so dropping it loses nothing
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - last < self.idle_ttl:
+                break
+            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+def get_session_token(request: Request) -> Optional[str]:
+    """Session token from cookie or Authorization header, if any"""
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            session_token = auth_header.split(" ")[1]
+    return session_token
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def get_client_ip(request: Request) -> str:
+    """Client address, taken from X-Forwarded-For when the peer is a trusted proxy"""
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(host):
+        return host
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if not forwarded_for:
+        return host
+    # Walk back from the nearest hop; the first untrusted address is the client.
+    # Anything further left was written by the client and can't be trusted.
+    for address in reversed([part.strip() for part in forwarded_for.split(",")]):
+        if address and not _is_trusted_proxy(address):
+            return address
+    return host
+
+
+def client_key(request: Request) -> str:
+    session_token = get_session_token(request)
+    if session_token:
+        return f"session:{session_token}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def ip_key(request: Request) -> str:
+    return f"ip:{get_client_ip(request)}"
+
+
+def rate_limit(limiter: TokenBucketLimiter, key_func=client_key):
+    """Route dependency that rejects requests over the limit with 429"""
+    async def check_rate_limit(request: Request):
+        allowed, retry_after = limiter.allow(key_func(request))
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    return Depends(check_rate_limit)
+
+
+class ConcurrencyLimiter:
+    """Non-blocking cap on concurrent jobs: callers over the limit are turned
+    away instead of waiting in a queue"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        if self.active >= self.limit:
+            return False
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+
+
+class EventLoopLagMonitor:
+    """Samples how late the event loop wakes up from a short sleep"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start - self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class LoadSheddingMiddleware:
+    """Rejects requests with 503 instead of queueing when the server is saturated.
+
+    A request is shed when max_concurrency requests are already in flight, or
+    when the event loop lag reported by lag_monitor exceeds max_lag seconds.
+    """
+
+    def __init__(self, app, max_concurrency: int = 200, max_lag: float = 0.5,
+                 lag_monitor: Optional[EventLoopLagMonitor] = None):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.max_lag = max_lag
+        self.lag_monitor = lag_monitor
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        overloaded = self.in_flight >= self.max_concurrency
+        lagging = self.lag_monitor is not None and self.lag_monitor.lag > self.max_lag
+        if overloaded or lagging:
+            logger.warning(
+                f"Shedding {scope['path']}: in_flight={self.in_flight} "
+                f"lag={self.lag_monitor.lag if self.lag_monitor else 0:.3f}s"
+            )
+            response = JSONResponse(
+                {"detail": "Server overloaded, try again shortly"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
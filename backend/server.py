@@ -10,6 +10,8 @@ from typing import List
 import uuid
 from datetime import datetime
 from auth import router as auth_router
+from ai import router as ai_router, shutdown_executor
+from ratelimit import EventLoopLagMonitor, LoadSheddingMiddleware
 
 
 ROOT_DIR = Path(__file__).parent
@@ -55,10 +57,20 @@ async def get_status_checks():
 
 # Include auth router in api_router first
 api_router.include_router(auth_router)
+api_router.include_router(ai_router)
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Shed load with a fast 503 instead of queueing when saturated
+loop_lag_monitor = EventLoopLagMonitor()
+app.add_middleware(
+    LoadSheddingMiddleware,
+    max_concurrency=int(os.environ.get('MAX_CONCURRENT_REQUESTS', 200)),
+    max_lag=float(os.environ.get('MAX_EVENT_LOOP_LAG', 0.5)),
+    lag_monitor=loop_lag_monitor,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -74,6 +86,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_lag_monitor():
+    loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_lag_monitor():
+    await loop_lag_monitor.stop()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+
+@app.on_event("shutdown")
+async def shutdown_engine_pool():
+    shutdown_executor()
@@ -1,4 +1,5 @@
 import { Chess } from 'chess.js';
+import AsyncStorage from '@react-native-async-storage/async-storage';
 
 // Simple AI implementation using minimax algorithm with alpha-beta pruning
 // For production, you would integrate actual Stockfish.js library
@@ -127,13 +128,44 @@ function getRandomMove(fen: string): string | null {
   return moves[Math.floor(Math.random() * moves.length)];
 }
 
-export async function getAIMove(
+const BACKEND_URL = process.env.EXPO_PUBLIC_BACKEND_URL || '';
+
+// Longer than the hard level's server-side time cap; past this we play locally
+const BACKEND_MOVE_TIMEOUT_MS = 12000;
+
+// Difficulty tiers live on the backend as node budgets with seeded evaluation
+// noise, so each move has a bounded, predictable cost.
+async function getBackendMove(
   fen: string,
   difficulty: 'easy' | 'medium' | 'hard'
 ): Promise<string | null> {
-  // Simulate thinking time
-  await new Promise((resolve) => setTimeout(resolve, 300));
+  // Signed-in players are rate limited per session instead of per IP
+  const token = await AsyncStorage.getItem('session_token');
+  const headers: { [key: string]: string } = { 'Content-Type': 'application/json' };
+  if (token) {
+    headers['Authorization'] = `Bearer ${token}`;
+  }
+
+  const controller = new AbortController();
+  const timeout = setTimeout(() => controller.abort(), BACKEND_MOVE_TIMEOUT_MS);
+  try {
+    const response = await fetch(`${BACKEND_URL}/api/ai/move`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({ fen, difficulty }),
+      signal: controller.signal,
+    });
+    if (!response.ok) {
+      throw new Error(`AI move request failed: ${response.status}`);
+    }
+    const data = await response.json();
+    return data.move;
+  } finally {
+    clearTimeout(timeout);
+  }
+}
 
+function getLocalMove(fen: string, difficulty: 'easy' | 'medium' | 'hard'): string | null {
   switch (difficulty) {
     case 'easy':
       // 70% random moves, 30% depth 1
@@ -155,4 +187,20 @@ export async function getAIMove(
   }
 }
 
+export async function getAIMove(
+  fen: string,
+  difficulty: 'easy' | 'medium' | 'hard'
+): Promise<string | null> {
+  try {
+    return await getBackendMove(fen, difficulty);
+  } catch (error) {
+    // Offline or backend unavailable - fall back to the on-device search
+    console.warn('Backend AI unavailable, using local engine:', error);
+  }
+
+  // Simulate thinking time
+  await new Promise((resolve) => setTimeout(resolve, 300));
+  return getLocalMove(fen, difficulty);
+}
+
 export { evaluateBoard, getBestMove };
\ No newline at end of file
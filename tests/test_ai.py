@@ -0,0 +1,93 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import ai
+
+
+START = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+
+
+@pytest.fixture
+def client():
+    ai.move_limiter._buckets.clear()
+    ai.move_ip_limiter._buckets.clear()
+    app = FastAPI()
+    app.include_router(ai.router)
+    yield TestClient(app)
+    ai.shutdown_executor()
+
+
+@pytest.mark.parametrize("fen", [
+    "not a fen",
+    "4k3/8/8/8/8/8/8/8 w - - 0 1",  # no white king
+    "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",  # pawn on the back rank
+])
+def test_move_rejects_invalid_positions(client, fen):
+    response = client.post("/ai/move", json={"fen": fen, "difficulty": "easy"})
+
+    assert response.status_code == 400
+
+
+def test_move_reports_nodes_used(client):
+    response = client.post("/ai/move", json={"fen": START, "difficulty": "easy"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["move"]
+    assert 0 < body["nodes"] <= ai.DIFFICULTY_LEVELS["easy"].max_nodes
+    assert body["timed_out"] is False
+
+
+def stub_search(monkeypatch):
+    monkeypatch.setattr(ai, "_search", lambda fen, difficulty: {
+        "move": "e5", "uci": "e7e5", "score": 0, "depth": 1, "nodes": 1, "timed_out": False,
+    })
+    monkeypatch.setattr(ai, "get_executor", lambda: None)  # the loop's default thread pool
+    # Freeze the limiters' clocks so no tokens refill mid-test
+    monkeypatch.setattr(ai.move_limiter, "clock", lambda: 1000.0)
+    monkeypatch.setattr(ai.move_ip_limiter, "clock", lambda: 1000.0)
+
+
+def test_rotating_session_tokens_still_hit_ip_limit(client, monkeypatch):
+    stub_search(monkeypatch)
+
+    codes = [
+        client.post(
+            "/ai/move",
+            json={"fen": START, "difficulty": "easy"},
+            headers={"Authorization": f"Bearer random-{i}"},
+        ).status_code
+        for i in range(ai.move_ip_limiter.burst + 2)
+    ]
+
+    assert codes[:ai.move_ip_limiter.burst] == [200] * ai.move_ip_limiter.burst
+    assert codes[ai.move_ip_limiter.burst:] == [429, 429]
+
+
+def test_move_sheds_load_when_engine_queue_is_full(client, monkeypatch):
+    monkeypatch.setattr(ai.pending_searches, "active", ai.pending_searches.limit)
+
+    response = client.post("/ai/move", json={"fen": START, "difficulty": "easy"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_rejected_session_does_not_drain_shared_ip_bucket(client, monkeypatch):
+    stub_search(monkeypatch)
+    session = {"Authorization": "Bearer hammering-player"}
+    body = {"fen": START, "difficulty": "easy"}
+
+    codes = [
+        client.post("/ai/move", json=body, headers=session).status_code
+        for _ in range(ai.move_ip_limiter.burst * 2)
+    ]
+    assert codes.count(200) == ai.move_limiter.burst
+
+    # Only the accepted requests were charged to the IP everyone shares
+    neighbour = {"Authorization": "Bearer neighbour"}
+    assert client.post("/ai/move", json=body, headers=neighbour).status_code == 200
+    assert len(ai.move_ip_limiter) == 1
+    tokens, _ = next(iter(ai.move_ip_limiter._buckets.values()))
+    assert tokens == ai.move_ip_limiter.burst - ai.move_limiter.burst - 1
@@ -0,0 +1,32 @@
+import chess
+import pytest
+
+from engine import DIFFICULTY_LEVELS, analyse, choose_move
+
+ITALIAN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+def test_choose_move_is_deterministic(difficulty):
+    first = choose_move(chess.Board(ITALIAN), difficulty)
+    second = choose_move(chess.Board(ITALIAN), difficulty)
+
+    assert first.best_move == second.best_move
+    assert first.nodes == second.nodes
+    assert not first.timed_out
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+def test_choose_move_stays_within_node_budget(difficulty):
+    result = choose_move(chess.Board(ITALIAN), difficulty)
+
+    assert result.best_move in chess.Board(ITALIAN).legal_moves
+    assert 0 < result.nodes <= DIFFICULTY_LEVELS[difficulty].max_nodes
+
+
+def test_analyse_finds_mate_in_one():
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 2 4")
+
+    result = analyse(board, max_nodes=5000)
+
+    assert result.best_move == chess.Move.from_uci("h5f7")
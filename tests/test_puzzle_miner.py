@@ -0,0 +1,51 @@
+from puzzle_miner import MAX_EVAL, mine_game
+
+# Small budgets keep the suite fast; both games are short and forcing
+SCAN_NODES = 5000
+VERIFY_NODES = 30000
+
+SCHOLARS_MATE = "e4 e5 Bc4 Nc6 Qh5 Nf6 Qxf7#".split()
+# 5...Bxd1?? wins the queen but walks into 6.Bxf7+ Ke7 7.Nd5#
+LEGAL_TRAP = "e4 e5 Nf3 d6 Bc4 Bg4 Nc3 g6 Nxe5 Bxd1 Bxf7+ Ke7 Nd5#".split()
+
+
+def test_scholars_mate_blunder_becomes_mate_in_one():
+    puzzles = mine_game(("scholar", SCHOLARS_MATE, None), SCAN_NODES, VERIFY_NODES)
+
+    assert [p["id"] for p in puzzles] == ["scholar-6"]
+    puzzle = puzzles[0]
+    assert puzzle["moves"] == ["h5f7"]
+    assert puzzle["mate_in"] == 1
+    assert puzzle["eval_swing"] <= 2 * MAX_EVAL
+
+
+def test_legal_trap_bait_is_not_a_puzzle():
+    puzzles = {p["id"]: p for p in mine_game(("legal", LEGAL_TRAP, None), SCAN_NODES, VERIFY_NODES)}
+
+    # Taking the queen loses, so the position after 5.Nxe5 must not be mined
+    assert "legal-9" not in puzzles
+    # The mate that punishes it is a genuine puzzle
+    assert puzzles["legal-10"]["moves"] == ["c4f7", "e8e7", "c3d5"]
+    assert puzzles["legal-10"]["mate_in"] == 2
+
+
+def test_game_without_moves_yields_nothing():
+    assert mine_game(("empty", [], None), SCAN_NODES, VERIFY_NODES) == []
+
+
+def test_bad_initial_fen_is_skipped():
+    assert mine_game(("bad-fen", ["e4"], "not a fen"), SCAN_NODES, VERIFY_NODES) == []
+    assert mine_game(("no-king", ["Kd2"], "4k3/8/8/8/8/8/8/8 w - - 0 1"),
+                     SCAN_NODES, VERIFY_NODES) == []
+
+
+def test_non_string_move_stops_the_game_without_raising():
+    # Puzzles found before the bad entry are kept
+    moves = SCHOLARS_MATE[:6] + [None, {"san": "Qxf7#"}]
+    puzzles = mine_game(("bad-move", moves, None), SCAN_NODES, VERIFY_NODES)
+
+    assert [p["id"] for p in puzzles] == ["bad-move-6"]
+
+
+def test_moves_that_are_not_a_list_are_skipped():
+    assert mine_game(("bad-list", "e4 e5", None), SCAN_NODES, VERIFY_NODES) == []
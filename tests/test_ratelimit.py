@@ -0,0 +1,92 @@
+import pytest
+from starlette.requests import Request
+
+from ratelimit import ConcurrencyLimiter, TokenBucketLimiter, get_client_ip
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+def make_limiter(clock, **kwargs):
+    return TokenBucketLimiter(clock=lambda: clock[0], **kwargs)
+
+
+def make_request(peer, forwarded_for=None):
+    headers = []
+    if forwarded_for:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({"type": "http", "headers": headers, "client": (peer, 12345)})
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    limiter = make_limiter(clock, rate=2.0, burst=3)
+
+    assert [limiter.allow("a")[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = limiter.allow("a")
+    assert not allowed
+    assert retry_after == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert limiter.allow("a")[0]
+    assert not limiter.allow("a")[0]
+
+    clock[0] += 60
+    assert [limiter.allow("a")[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_buckets_are_independent_per_key(clock):
+    limiter = make_limiter(clock, rate=1.0, burst=1)
+
+    assert limiter.allow("a")[0]
+    assert not limiter.allow("a")[0]
+    assert limiter.allow("b")[0]
+
+
+def test_eviction_caps_number_of_keys(clock):
+    limiter = make_limiter(clock, rate=1.0, burst=1, max_keys=3)
+
+    for key in "abcde":
+        limiter.allow(key)
+
+    assert len(limiter) == 3
+    # The least recently used keys went first and come back with a full bucket
+    assert limiter.allow("a")[0]
+
+
+def test_eviction_drops_idle_buckets(clock):
+    limiter = make_limiter(clock, rate=1.0, burst=1, idle_ttl=10.0)
+    limiter.allow("a")
+    limiter.allow("b")
+
+    clock[0] += 5
+    limiter.allow("b")
+    assert len(limiter) == 2
+
+    clock[0] += 6
+    limiter.allow("c")
+    assert len(limiter) == 2  # "a" idled out, "b" was used recently
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer():
+    request = make_request("203.0.113.5", forwarded_for="198.51.100.1")
+
+    assert get_client_ip(request) == "203.0.113.5"
+
+
+def test_client_ip_uses_forwarded_for_from_trusted_proxy():
+    # The left-most entry is client supplied and must not be believed
+    request = make_request("10.0.0.2", forwarded_for="1.2.3.4, 198.51.100.7, 10.0.0.9")
+
+    assert get_client_ip(request) == "198.51.100.7"
+
+
+def test_concurrency_limiter_rejects_instead_of_queueing():
+    limiter = ConcurrencyLimiter(2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()